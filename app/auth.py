@@ -6,8 +6,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.config import settings
-from app.database import get_master_db
+from app.database import get_master_db, get_organization_db
 from app.models import AdminUser
+from app.profiling import profiled
 from app.schemas import TokenData
 
 # Password hashing
@@ -65,6 +66,7 @@ def authenticate_admin(db: Session, email: str, password: str) -> Optional[Admin
     return admin
 
 
+@profiled
 def get_current_admin(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_master_db)
@@ -84,4 +86,21 @@ def get_current_admin(
     if admin is None:
         raise credentials_exception
     
-    return admin 
\ No newline at end of file
+    return admin 
+
+
+def get_current_organization_db(current_admin: AdminUser = Depends(get_current_admin)):
+    """Get a database session for the current admin's organization"""
+    yield from get_organization_db(current_admin.organization.name)
+
+
+def get_profiling_admin(current_admin: AdminUser = Depends(get_current_admin)) -> AdminUser:
+    """Get the current admin if they are allowed to use the process-wide profiler"""
+    allowed = {email.lower() for email in settings.profiling_admin_emails}
+    if current_admin.email.lower() not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to use the profiler"
+        )
+    
+    return current_admin
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -18,6 +18,11 @@ class Settings(BaseSettings):
     org_db_password: str = "password"
     org_db_template: str = "template0"
     
+    # Profiling Configuration
+    profiling_admin_emails: List[str] = []
+    profiling_max_duration_seconds: int = 300
+    profiling_max_deterministic_duration_seconds: int = 30
+    
     class Config:
         env_file = ".env"
 
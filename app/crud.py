@@ -1,8 +1,19 @@
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
-from app.models import Organization, AdminUser, OrganizationUser
-from app.schemas import OrganizationCreate, AdminCreate, OrganizationUserCreate
+from app.models import Organization, AdminUser, OrganizationUser, OrganizationUserStats
+from app.schemas import OrganizationCreate, AdminCreate, OrganizationUserCreate, OrganizationUserUpdate
 from app.auth import get_password_hash
-from typing import Optional
+from app.singleflight import SingleFlight
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Concurrent lookups of the same organization name share one master DB query
+_organization_name_lookups = SingleFlight()
+
+# Statistics bucket for organization users stored without a role
+UNASSIGNED_ROLE = "unassigned"
 
 
 def create_organization(db: Session, org_data: OrganizationCreate) -> Optional[Organization]:
@@ -54,6 +65,35 @@ def get_organization_by_name(db: Session, organization_name: str) -> Optional[Or
     return db.query(Organization).filter(Organization.name == organization_name).first()
 
 
+def get_organization_by_name_shared(db: Session, organization_name: str) -> Optional[Organization]:
+    """Get organization by name, coalescing concurrent lookups for the same name
+    
+    The returned organization is detached from the session since it may be
+    handed to other requests, so treat it as read-only.
+    """
+    def lookup():
+        org = get_organization_by_name(db, organization_name)
+        if org:
+            db.expunge(org)
+        return org
+    
+    return _organization_name_lookups.do(organization_name, lookup)
+
+
+def get_organizations(db: Session, names: List[str], ids: List[int]) -> List[Organization]:
+    """Get all organizations matching any of the given names or ids in a single query"""
+    conditions = []
+    if names:
+        conditions.append(Organization.name.in_(set(names)))
+    if ids:
+        conditions.append(Organization.id.in_(set(ids)))
+    
+    if not conditions:
+        return []
+    
+    return db.query(Organization).filter(or_(*conditions)).all()
+
+
 def get_organization_by_email(db: Session, email: str) -> Optional[Organization]:
     """Get organization by email"""
     return db.query(Organization).filter(Organization.email == email).first()
@@ -64,8 +104,111 @@ def get_admin_by_email(db: Session, email: str) -> Optional[AdminUser]:
     return db.query(AdminUser).filter(AdminUser.email == email).first()
 
 
-def create_organization_user(db: Session, user_data: OrganizationUserCreate) -> OrganizationUser:
-    """Create a new user in an organization's database"""
+def _user_stats_key(user: OrganizationUser) -> Tuple[str, bool]:
+    """The (role, is_active) pair a user contributes to the organization statistics"""
+    return user.role or UNASSIGNED_ROLE, bool(user.is_active)
+
+
+def _lock_organization_stats(master_db: Session, organization_id: int):
+    """Lock the organization's master row until master_db commits or rolls back
+    
+    User writers hold this lock from before their organization database commit
+    until their statistics delta commits, and rebuilds hold it while counting,
+    so a rebuild sees either both the user change and its delta or neither.
+    """
+    master_db.query(Organization.id).filter(
+        Organization.id == organization_id
+    ).with_for_update().first()
+
+
+def _apply_user_stats_delta(master_db: Session, organization_id: int, role: str, users: int, active: int):
+    """Adjust the counters of one role, creating its row if needed
+    
+    The caller must hold the organization statistics lock.
+    """
+    updated = master_db.query(OrganizationUserStats).filter(
+        OrganizationUserStats.organization_id == organization_id,
+        OrganizationUserStats.role == role
+    ).update({
+        OrganizationUserStats.user_count: OrganizationUserStats.user_count + users,
+        OrganizationUserStats.active_user_count: OrganizationUserStats.active_user_count + active
+    }, synchronize_session=False)
+    
+    if not updated:
+        master_db.add(OrganizationUserStats(
+            organization_id=organization_id,
+            role=role,
+            user_count=users,
+            active_user_count=active
+        ))
+
+
+def _record_user_stats_change(
+    master_db: Session,
+    db: Session,
+    organization_id: int,
+    before: Optional[Tuple[str, bool]],
+    after: Optional[Tuple[str, bool]]
+):
+    """Roll a user's change from one (role, is_active) state to another into the master statistics
+    
+    The user change is already committed, so failures are logged rather than
+    raised and the drift is left for a rebuild to repair. Committing or rolling
+    back master_db releases the organization statistics lock.
+    """
+    deltas: Dict[str, List[int]] = {}
+    for state, sign in ((before, -1), (after, 1)):
+        if state is None:
+            continue
+        role, is_active = state
+        delta = deltas.setdefault(role, [0, 0])
+        delta[0] += sign
+        delta[1] += sign if is_active else 0
+    
+    try:
+        has_stats = master_db.query(OrganizationUserStats.id).filter(
+            OrganizationUserStats.organization_id == organization_id
+        ).first() is not None
+        
+        if not has_stats:
+            # First tracked change of an organization that may already have users,
+            # which the change itself is now part of
+            rebuild_organization_user_stats(master_db, db, organization_id)
+            return
+        
+        for role, (users, active) in deltas.items():
+            if users or active:
+                _apply_user_stats_delta(master_db, organization_id, role, users, active)
+        master_db.commit()
+    except Exception as e:
+        master_db.rollback()
+        logger.error(f"Error updating statistics for organization {organization_id}: {e}")
+
+
+def _commit_user_change(db: Session, master_db: Session, organization_id: int):
+    """Commit an organization user change while holding the organization statistics lock"""
+    try:
+        _lock_organization_stats(master_db, organization_id)
+    except Exception as e:
+        # The user change must not depend on the master database; a rebuild repairs the drift
+        master_db.rollback()
+        logger.error(f"Error locking statistics for organization {organization_id}: {e}")
+    
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        master_db.rollback()
+        raise e
+
+
+def create_organization_user(
+    db: Session,
+    user_data: OrganizationUserCreate,
+    master_db: Session,
+    organization_id: int
+) -> OrganizationUser:
+    """Create a new user in an organization's database and count it in the organization statistics"""
     user = OrganizationUser(
         email=user_data.email,
         password_hash=get_password_hash(user_data.password),
@@ -75,11 +218,122 @@ def create_organization_user(db: Session, user_data: OrganizationUserCreate) ->
     )
     
     db.add(user)
-    db.commit()
+    _commit_user_change(db, master_db, organization_id)
     db.refresh(user)
+    
+    _record_user_stats_change(master_db, db, organization_id, None, _user_stats_key(user))
     return user
 
 
+def update_organization_user(
+    db: Session,
+    user: OrganizationUser,
+    user_data: OrganizationUserUpdate,
+    master_db: Session,
+    organization_id: int
+) -> OrganizationUser:
+    """Update a user in an organization's database and adjust the organization statistics"""
+    before = _user_stats_key(user)
+    
+    # A null field means "leave unchanged"; role and is_active are never cleared
+    for field, value in user_data.model_dump(exclude_unset=True, exclude_none=True).items():
+        setattr(user, field, value)
+    
+    _commit_user_change(db, master_db, organization_id)
+    db.refresh(user)
+    
+    _record_user_stats_change(master_db, db, organization_id, before, _user_stats_key(user))
+    return user
+
+
+def deactivate_organization_user(
+    db: Session,
+    user: OrganizationUser,
+    master_db: Session,
+    organization_id: int
+) -> OrganizationUser:
+    """Deactivate a user in an organization's database"""
+    return update_organization_user(
+        db, user, OrganizationUserUpdate(is_active=False), master_db, organization_id
+    )
+
+
+def get_organization_user_stats(master_db: Session, organization_id: int) -> List[OrganizationUserStats]:
+    """Get the per-role user statistics of an organization"""
+    return master_db.query(OrganizationUserStats).filter(
+        OrganizationUserStats.organization_id == organization_id
+    ).order_by(OrganizationUserStats.role).all()
+
+
+def _count_organization_users(db: Session) -> Dict[str, Tuple[int, int]]:
+    """Count an organization's users per role as (user_count, active_user_count)"""
+    rows = db.query(
+        OrganizationUser.role,
+        OrganizationUser.is_active,
+        func.count(OrganizationUser.id)
+    ).group_by(OrganizationUser.role, OrganizationUser.is_active).all()
+    
+    counts: Dict[str, Tuple[int, int]] = {}
+    for role, is_active, count in rows:
+        role = role or UNASSIGNED_ROLE
+        users, active = counts.get(role, (0, 0))
+        counts[role] = (users + count, active + (count if is_active else 0))
+    return counts
+
+
+def rebuild_organization_user_stats(master_db: Session, db: Session, organization_id: int) -> Dict[str, dict]:
+    """Recount an organization's users from its database and replace the stored statistics
+    
+    Holds the organization statistics lock while counting, so user changes
+    that are committed but whose delta is not yet applied cannot be counted
+    twice. Returns the roles whose stored counters differed from the recount,
+    mapping each to its stored and rebuilt (user_count, active_user_count).
+    """
+    try:
+        _lock_organization_stats(master_db, organization_id)
+        
+        stored = {
+            stats.role: stats
+            for stats in master_db.query(OrganizationUserStats).filter(
+                OrganizationUserStats.organization_id == organization_id
+            ).all()
+        }
+        rebuilt = _count_organization_users(db)
+        
+        drift = {}
+        for role in stored.keys() | rebuilt.keys():
+            stats = stored.get(role)
+            old = (stats.user_count, stats.active_user_count) if stats else (0, 0)
+            new = rebuilt.get(role, (0, 0))
+            
+            if old != new:
+                drift[role] = {"stored": old, "rebuilt": new}
+            
+            if stats is None:
+                master_db.add(OrganizationUserStats(
+                    organization_id=organization_id,
+                    role=role,
+                    user_count=new[0],
+                    active_user_count=new[1]
+                ))
+            elif role not in rebuilt:
+                master_db.delete(stats)
+            elif old != new:
+                stats.user_count, stats.active_user_count = new
+        
+        master_db.commit()
+        return drift
+        
+    except Exception as e:
+        master_db.rollback()
+        raise e
+
+
+def get_organization_user(db: Session, user_id: int) -> Optional[OrganizationUser]:
+    """Get organization user by id"""
+    return db.query(OrganizationUser).filter(OrganizationUser.id == user_id).first()
+
+
 def get_organization_user_by_email(db: Session, email: str) -> Optional[OrganizationUser]:
     """Get organization user by email"""
     return db.query(OrganizationUser).filter(OrganizationUser.email == email).first() 
\ No newline at end of file
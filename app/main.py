@@ -1,7 +1,8 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import organization, auth
+from app.routers import organization, users, auth, profiling
 from app.database import Base, master_engine
+from app.profiling import ProfilingMiddleware
 import logging
 
 # Configure logging
@@ -22,9 +23,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(organization.router)
+app.include_router(users.router)
 app.include_router(auth.router)
+app.include_router(profiling.router)
 
 
 @app.on_event("startup")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -35,6 +35,19 @@ class AdminUser(Base):
     organization = relationship("Organization", back_populates="admin")
 
 
+class OrganizationUserStats(Base):
+    """Master database model for incrementally maintained per-role user counts of an organization"""
+    __tablename__ = "organization_user_stats"
+    __table_args__ = (UniqueConstraint("organization_id", "role"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    role = Column(String, nullable=False)
+    user_count = Column(Integer, nullable=False, default=0)
+    active_user_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class OrganizationUser(Base):
     """Organization-specific database model for users within an organization"""
     __tablename__ = "users"
@@ -0,0 +1,353 @@
+import asyncio
+import functools
+import inspect
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Paths served by the profiling router itself are never profiled
+PROFILING_PATH_PREFIX = "/admin/profiling"
+
+# Caps so a long profiling window cannot grow memory without bound
+MAX_RECORDED_REQUESTS = 1000
+MAX_QUERIES_PER_REQUEST = 100
+MAX_STATEMENT_LENGTH = 200
+
+# Profile record of the request being handled in the current context
+_current_request: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "profiling_current_request", default=None
+)
+
+
+def _frame_label(frame) -> str:
+    """Label a Python frame as module:function"""
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def _c_function_label(func) -> str:
+    """Label a C function as module:qualname"""
+    module = getattr(func, "__module__", None) or "builtins"
+    return f"{module}:{getattr(func, '__qualname__', repr(func))}"
+
+
+class RequestProfile:
+    """Timing and SQL statistics for a single profiled request"""
+
+    def __init__(self, session: "ProfilingSession", method: str, path: str):
+        self.session = session
+        self.method = method
+        self.path = path
+        self.status_code: Optional[int] = None
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.sql_count = 0
+        self.sql_time_ms = 0.0
+        self.queries = []
+
+    def add_query(self, statement: str, elapsed: float):
+        """Record one executed SQL statement"""
+        elapsed_ms = elapsed * 1000
+        self.sql_count += 1
+        self.sql_time_ms += elapsed_ms
+        if len(self.queries) < MAX_QUERIES_PER_REQUEST:
+            self.queries.append({
+                "statement": " ".join(statement.split())[:MAX_STATEMENT_LENGTH],
+                "duration_ms": round(elapsed_ms, 3),
+            })
+
+    def finish(self, status_code: Optional[int]):
+        """Mark the request as complete"""
+        self.status_code = status_code
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "sql_count": self.sql_count,
+            "sql_time_ms": round(self.sql_time_ms, 3),
+            "queries": list(self.queries),
+        }
+
+
+class _StackTracer:
+    """sys.setprofile hook that accumulates self time per call stack"""
+
+    def __init__(self):
+        self.labels = []
+        self.frames = []  # [start, child_time] per entry in labels
+        self.stacks = Counter()
+
+    def __call__(self, frame, event_name, arg):
+        now = time.perf_counter()
+        if event_name == "call":
+            self.labels.append(_frame_label(frame))
+            self.frames.append([now, 0.0])
+        elif event_name == "c_call":
+            self.labels.append(_c_function_label(arg))
+            self.frames.append([now, 0.0])
+        elif event_name in ("return", "c_return", "c_exception"):
+            if not self.frames:
+                return
+            start, child_time = self.frames.pop()
+            elapsed = now - start
+            self.stacks[";".join(self.labels)] += int((elapsed - child_time) * 1_000_000)
+            self.labels.pop()
+            if self.frames:
+                self.frames[-1][1] += elapsed
+
+
+class ProfilingSession:
+    """A time-boxed profiling window over a subset of requests"""
+
+    def __init__(
+        self,
+        mode: str,
+        duration_seconds: float,
+        route: Optional[str] = None,
+        sample_percent: float = 100.0,
+        interval_ms: int = 5,
+    ):
+        self.mode = mode
+        self.route = route
+        self.sample_percent = sample_percent
+        self.interval = interval_ms / 1000
+        self.started_at = datetime.now(timezone.utc)
+        self.deadline = time.monotonic() + duration_seconds
+        self.duration_seconds = duration_seconds
+        self.stacks = Counter()
+        self.requests = deque(maxlen=MAX_RECORDED_REQUESTS)
+        self.samples = 0
+        self._threads = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sampler = None
+        if mode == "sampling":
+            self._sampler = threading.Thread(
+                target=self._sample_loop, name="profiling-sampler", daemon=True
+            )
+            self._sampler.start()
+
+    def is_running(self) -> bool:
+        return not self._stopped.is_set() and time.monotonic() < self.deadline
+
+    def stop(self):
+        """End the window; requests already in flight finish unprofiled"""
+        self._stopped.set()
+        if self._sampler is not None and self._sampler is not threading.current_thread():
+            self._sampler.join()
+
+    def select(self, method: str, path: str) -> Optional[RequestProfile]:
+        """Decide whether a request should be profiled and start its record"""
+        if not self.is_running():
+            return None
+        if self.route and not path.startswith(self.route):
+            return None
+        if self.sample_percent < 100 and random.random() * 100 >= self.sample_percent:
+            return None
+        record = RequestProfile(self, method, path)
+        with self._lock:
+            self.requests.append(record)
+        return record
+
+    def run(self, func, args, kwargs):
+        """Run an endpoint function in the current thread under the profiler"""
+        if self.mode == "deterministic":
+            tracer = _StackTracer()
+            previous = sys.getprofile()
+            sys.setprofile(tracer)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # Restore whatever profiler (coverage, another tracer) was installed before
+                sys.setprofile(previous)
+                self._merge(tracer.stacks)
+
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads.add(ident)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._threads.discard(ident)
+
+    def _merge(self, stacks: Counter):
+        with self._lock:
+            self.stacks.update(stacks)
+
+    def _sample_loop(self):
+        """Periodically capture the stacks of threads running profiled endpoints"""
+        while not self._stopped.wait(self.interval) and self.is_running():
+            with self._lock:
+                idents = list(self._threads)
+            if not idents:
+                continue
+            frames = sys._current_frames()
+            stacks = Counter()
+            for ident in idents:
+                frame = frames.get(ident)
+                labels = []
+                # Stop at the profiler entry point so threadpool frames are dropped
+                while frame is not None and frame.f_code is not _RUN_CODE:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                if labels:
+                    stacks[";".join(reversed(labels))] += 1
+            with self._lock:
+                self.stacks.update(stacks)
+                self.samples += sum(stacks.values())
+
+    def collapsed(self) -> str:
+        """Aggregated stacks in flamegraph.pl collapsed format"""
+        with self._lock:
+            stacks = self.stacks.most_common()
+        return "\n".join(f"{stack} {count}" for stack, count in stacks if count > 0)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            requests = [record.to_dict() for record in self.requests if record.duration_ms is not None]
+        return {
+            "mode": self.mode,
+            "route": self.route,
+            "sample_percent": self.sample_percent,
+            "duration_seconds": self.duration_seconds,
+            "started_at": self.started_at,
+            "running": self.is_running(),
+            "unit": "samples" if self.mode == "sampling" else "microseconds",
+            "samples": self.samples,
+            "collapsed": self.collapsed(),
+            "requests": requests,
+        }
+
+
+_RUN_CODE = ProfilingSession.run.__code__
+
+
+class Profiler:
+    """Holds the current profiling session for this process"""
+
+    def __init__(self):
+        self.session: Optional[ProfilingSession] = None
+        self._lock = threading.Lock()
+
+    def start(self, **options) -> Optional[ProfilingSession]:
+        """Start a new session, or return None if one is already running"""
+        with self._lock:
+            if self.session is not None and self.session.is_running():
+                return None
+            if self.session is not None:
+                self.session.stop()
+            self.session = ProfilingSession(**options)
+            return self.session
+
+    def stop(self) -> Optional[ProfilingSession]:
+        """Stop the current session and return it for reporting"""
+        with self._lock:
+            if self.session is not None:
+                self.session.stop()
+            return self.session
+
+    def select(self, method: str, path: str) -> Optional[RequestProfile]:
+        session = self.session
+        if session is None or path.startswith(PROFILING_PATH_PREFIX):
+            return None
+        return session.select(method, path)
+
+
+profiler = Profiler()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that selects requests for the active profiling session"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        record = profiler.select(scope["method"], scope["path"])
+        if record is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = _current_request.set(record)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_request.reset(token)
+            record.finish(status_code)
+
+
+def profiled(func):
+    """Wrap a sync endpoint or dependency so it runs under the session that selected its request
+
+    FastAPI runs each sync dependency in its own threadpool call, outside the
+    endpoint, so dependencies only show up in profiles when decorated with this.
+    Generator and async functions are returned unchanged.
+    """
+    if asyncio.iscoroutinefunction(func) or inspect.isgeneratorfunction(func):
+        return func
+    # include_router rebuilds routes with the same route class, so skip wrapped functions
+    if getattr(func, "__profiled__", False):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        record = _current_request.get()
+        if record is None:
+            return func(*args, **kwargs)
+        return record.session.run(func, args, kwargs)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route class that makes endpoints visible to the profiler
+
+    Dependencies are not wrapped here, since FastAPI keys dependency overrides
+    and its per-request cache on the original callable; decorate them with
+    profiled() where they are defined instead.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, profiled(endpoint), **kwargs)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Keep the start on the per-execution context, not the pooled connection,
+    # so statements that fail leave nothing behind
+    if context is not None and _current_request.get() is not None:
+        context._profiling_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record = _current_request.get()
+    start = getattr(context, "_profiling_start", None)
+    if record is not None and start is not None:
+        record.add_query(statement, time.perf_counter() - start)
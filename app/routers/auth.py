@@ -3,11 +3,12 @@ from sqlalchemy.orm import Session
 from app.database import get_master_db
 from app.crud import get_admin_by_email
 from app.auth import authenticate_admin, create_access_token, get_current_admin
+from app.profiling import ProfiledRoute
 from app.schemas import AdminLogin, Token
 from datetime import timedelta
 from app.config import settings
 
-router = APIRouter(prefix="/admin", tags=["authentication"])
+router = APIRouter(prefix="/admin", tags=["authentication"], route_class=ProfiledRoute)
 
 
 @router.post("/login", response_model=Token)
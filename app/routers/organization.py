@@ -1,11 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from app.database import get_master_db, create_organization_database
-from app.crud import create_organization, get_organization_by_name
-from app.schemas import OrganizationCreate, OrganizationResponse
+from app.auth import get_current_admin, get_current_organization_db
+from app.database import get_master_db, get_organization_db, create_organization_database, MasterSessionLocal
+from app.crud import (
+    create_organization,
+    get_organization_by_name_shared,
+    get_organizations,
+    get_organization_user_stats,
+    rebuild_organization_user_stats,
+)
+from app.profiling import ProfiledRoute
+from app.schemas import (
+    OrganizationCreate,
+    OrganizationResponse,
+    OrganizationBatchRequest,
+    OrganizationBatchResponse,
+    OrganizationStatsResponse,
+)
 from typing import List
+import logging
 
-router = APIRouter(prefix="/org", tags=["organizations"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/org", tags=["organizations"], route_class=ProfiledRoute)
 
 
 @router.post("/create", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED)
@@ -56,7 +73,7 @@ def get_organization_by_name_endpoint(
     """
     Get organization by name
     """
-    organization = get_organization_by_name(db, organization_name)
+    organization = get_organization_by_name_shared(db, organization_name)
     
     if not organization:
         raise HTTPException(
@@ -67,6 +84,95 @@ def get_organization_by_name_endpoint(
     return organization
 
 
+@router.post("/get-many", response_model=OrganizationBatchResponse)
+def get_many_organizations_endpoint(
+    lookup: OrganizationBatchRequest,
+    db: Session = Depends(get_master_db)
+):
+    """
+    Get many organizations by name and/or id with a single query
+    """
+    organizations = get_organizations(db, lookup.names, lookup.ids)
+    
+    found_names = {org.name for org in organizations}
+    found_ids = {org.id for org in organizations}
+    
+    return {
+        "organizations": organizations,
+        "missing_names": [name for name in dict.fromkeys(lookup.names) if name not in found_names],
+        "missing_ids": [org_id for org_id in dict.fromkeys(lookup.ids) if org_id not in found_ids]
+    }
+
+
+@router.get("/stats", response_model=OrganizationStatsResponse)
+def get_organization_stats_endpoint(
+    current_admin = Depends(get_current_admin),
+    db: Session = Depends(get_master_db)
+):
+    """
+    Get user counts and per-role breakdown of the current admin's organization
+    """
+    organization = current_admin.organization
+    roles = get_organization_user_stats(db, organization.id)
+    
+    user_count = sum(stats.user_count for stats in roles)
+    active_user_count = sum(stats.active_user_count for stats in roles)
+    
+    return {
+        "organization_id": organization.id,
+        "organization_name": organization.name,
+        "user_count": user_count,
+        "active_user_count": active_user_count,
+        "inactive_user_count": user_count - active_user_count,
+        "roles": roles,
+        "updated_at": max((stats.updated_at for stats in roles if stats.updated_at), default=None)
+    }
+
+
+def rebuild_organization_stats_task(organization_id: int, organization_name: str):
+    """Recount an organization's users and log any drift from the stored statistics"""
+    master_db = MasterSessionLocal()
+    org_db_session = get_organization_db(organization_name)
+    try:
+        org_db = next(org_db_session)
+        drift = rebuild_organization_user_stats(master_db, org_db, organization_id)
+        
+        if drift:
+            logger.warning(f"Rebuilt statistics for organization {organization_name} differed: {drift}")
+        else:
+            logger.info(f"Rebuilt statistics for organization {organization_name}: no drift")
+    except Exception as e:
+        logger.error(f"Error rebuilding statistics for organization {organization_name}: {e}")
+    finally:
+        org_db_session.close()
+        master_db.close()
+
+
+@router.post("/stats/rebuild", status_code=status.HTTP_202_ACCEPTED)
+def rebuild_organization_stats_endpoint(
+    background_tasks: BackgroundTasks,
+    response: Response,
+    background: bool = True,
+    current_admin = Depends(get_current_admin),
+    db: Session = Depends(get_master_db),
+    org_db: Session = Depends(get_current_organization_db)
+):
+    """
+    Recount the current admin's organization users, in the background unless background=false
+    
+    A synchronous rebuild returns the drift it found, which is empty when the counters were consistent.
+    """
+    organization = current_admin.organization
+    
+    if background:
+        background_tasks.add_task(rebuild_organization_stats_task, organization.id, organization.name)
+        return {"message": "Statistics rebuild scheduled"}
+    
+    drift = rebuild_organization_user_stats(db, org_db, organization.id)
+    response.status_code = status.HTTP_200_OK
+    return {"message": "Statistics rebuilt", "drift": drift}
+
+
 @router.get("/list", response_model=List[OrganizationResponse])
 def list_organizations(
     skip: int = 0,
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.auth import get_profiling_admin
+from app.config import settings
+from app.profiling import profiler, PROFILING_PATH_PREFIX
+from app.schemas import ProfilingStart, ProfilingResult
+
+router = APIRouter(
+    prefix=PROFILING_PATH_PREFIX,
+    tags=["profiling"],
+    dependencies=[Depends(get_profiling_admin)]
+)
+
+
+@router.post("/start", response_model=ProfilingResult, status_code=status.HTTP_201_CREATED)
+def start_profiling(options: ProfilingStart):
+    """
+    Start a profiling window for a time window and/or a share of requests matching a route
+    """
+    max_duration = settings.profiling_max_duration_seconds
+    if options.mode == "deterministic":
+        max_duration = min(max_duration, settings.profiling_max_deterministic_duration_seconds)
+    
+    if options.duration_seconds > max_duration:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{options.mode.capitalize()} profiling duration cannot exceed {max_duration} seconds"
+        )
+
+    session = profiler.start(**options.model_dump())
+
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profiling session is already running"
+        )
+
+    return session.to_dict()
+
+
+@router.post("/stop", response_model=ProfilingResult)
+def stop_profiling():
+    """
+    Stop the current profiling session and return its results
+    """
+    session = profiler.stop()
+
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No profiling session found"
+        )
+
+    return session.to_dict()
+
+
+@router.get("/results", response_model=ProfilingResult)
+def get_profiling_results():
+    """
+    Get aggregated stacks and per-request SQL statistics of the latest session
+    """
+    session = profiler.session
+
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No profiling session found"
+        )
+
+    return session.to_dict()
+
+
+@router.get("/collapsed", response_class=PlainTextResponse)
+def get_profiling_collapsed():
+    """
+    Get aggregated stacks of the latest session in flamegraph collapsed format
+    """
+    session = profiler.session
+
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No profiling session found"
+        )
+
+    return session.collapsed()
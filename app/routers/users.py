@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.auth import get_current_admin, get_current_organization_db
+from app.database import get_master_db
+from app.crud import (
+    create_organization_user,
+    update_organization_user,
+    deactivate_organization_user,
+    get_organization_user,
+    get_organization_user_by_email,
+)
+from app.profiling import ProfiledRoute
+from app.schemas import OrganizationUserCreate, OrganizationUserUpdate, OrganizationUserResponse
+
+router = APIRouter(prefix="/org/users", tags=["organization users"], route_class=ProfiledRoute)
+
+
+def _get_user_or_404(org_db: Session, user_id: int):
+    user = get_organization_user(org_db, user_id)
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    return user
+
+
+@router.post("", response_model=OrganizationUserResponse, status_code=status.HTTP_201_CREATED)
+def create_organization_user_endpoint(
+    user_data: OrganizationUserCreate,
+    current_admin = Depends(get_current_admin),
+    db: Session = Depends(get_master_db),
+    org_db: Session = Depends(get_current_organization_db)
+):
+    """
+    Create a user in the current admin's organization
+    """
+    if get_organization_user_by_email(org_db, user_data.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this email already exists"
+        )
+    
+    return create_organization_user(org_db, user_data, db, current_admin.organization_id)
+
+
+@router.patch("/{user_id}", response_model=OrganizationUserResponse)
+def update_organization_user_endpoint(
+    user_id: int,
+    user_data: OrganizationUserUpdate,
+    current_admin = Depends(get_current_admin),
+    db: Session = Depends(get_master_db),
+    org_db: Session = Depends(get_current_organization_db)
+):
+    """
+    Update a user in the current admin's organization
+    """
+    user = _get_user_or_404(org_db, user_id)
+    return update_organization_user(org_db, user, user_data, db, current_admin.organization_id)
+
+
+@router.post("/{user_id}/deactivate", response_model=OrganizationUserResponse)
+def deactivate_organization_user_endpoint(
+    user_id: int,
+    current_admin = Depends(get_current_admin),
+    db: Session = Depends(get_master_db),
+    org_db: Session = Depends(get_current_organization_db)
+):
+    """
+    Deactivate a user in the current admin's organization
+    """
+    user = _get_user_or_404(org_db, user_id)
+    return deactivate_organization_user(org_db, user, db, current_admin.organization_id)
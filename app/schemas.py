@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
@@ -22,6 +22,17 @@ class OrganizationResponse(BaseModel):
         from_attributes = True
 
 
+class OrganizationBatchRequest(BaseModel):
+    names: List[str] = Field(default_factory=list, max_length=500)
+    ids: List[int] = Field(default_factory=list, max_length=500)
+
+
+class OrganizationBatchResponse(BaseModel):
+    organizations: List[OrganizationResponse]
+    missing_names: List[str]
+    missing_ids: List[int]
+
+
 # Admin User Schemas
 class AdminLogin(BaseModel):
     email: EmailStr
@@ -67,6 +78,13 @@ class OrganizationUserCreate(BaseModel):
     role: str = "user"
 
 
+class OrganizationUserUpdate(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: Optional[str] = None
+    is_active: Optional[bool] = None
+
+
 class OrganizationUserResponse(BaseModel):
     id: int
     email: str
@@ -77,4 +95,61 @@ class OrganizationUserResponse(BaseModel):
     is_active: bool
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+
+# Organization Statistics Schemas
+class RoleStats(BaseModel):
+    role: str
+    user_count: int
+    active_user_count: int
+    
+    class Config:
+        from_attributes = True
+
+
+class OrganizationStatsResponse(BaseModel):
+    organization_id: int
+    organization_name: str
+    user_count: int
+    active_user_count: int
+    inactive_user_count: int
+    roles: List[RoleStats]
+    updated_at: Optional[datetime] = None
+
+
+# Profiling Schemas
+class ProfilingStart(BaseModel):
+    mode: Literal["sampling", "deterministic"] = "sampling"
+    duration_seconds: float = Field(default=30, gt=0)
+    route: Optional[str] = None
+    sample_percent: float = Field(default=100, ge=0, le=100)
+    interval_ms: int = Field(default=5, ge=1, le=1000)
+
+
+class ProfiledQuery(BaseModel):
+    statement: str
+    duration_ms: float
+
+
+class ProfiledRequest(BaseModel):
+    method: str
+    path: str
+    status_code: Optional[int] = None
+    duration_ms: Optional[float] = None
+    sql_count: int
+    sql_time_ms: float
+    queries: List[ProfiledQuery]
+
+
+class ProfilingResult(BaseModel):
+    mode: str
+    route: Optional[str] = None
+    sample_percent: float
+    duration_seconds: float
+    started_at: datetime
+    running: bool
+    unit: str
+    samples: int
+    collapsed: str
+    requests: List[ProfiledRequest]
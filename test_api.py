@@ -53,6 +53,22 @@ def test_get_organization(org_name):
         print(f"Error: {response.text}")
         return None
 
+def test_get_many_organizations(org_names):
+    """Test getting many organizations in one request"""
+    print(f"\nTesting get many organizations: {org_names}")
+    
+    response = requests.post(f"{BASE_URL}/org/get-many", json={"names": org_names})
+    print(f"Get many organizations: {response.status_code}")
+    
+    if response.status_code == 200:
+        result = response.json()
+        print(f"Organizations found: {[org['name'] for org in result['organizations']]}")
+        print(f"Missing names: {result['missing_names']}")
+        return result
+    else:
+        print(f"Error: {response.text}")
+        return None
+
 def test_admin_login(email, password):
     """Test admin login"""
     print(f"\nTesting admin login: {email}")
@@ -90,6 +106,95 @@ def test_admin_me(token):
         print(f"Error: {response.text}")
         return None
 
+def test_organization_stats(token):
+    """Test getting organization statistics"""
+    print("\nTesting organization stats endpoint...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    response = requests.get(f"{BASE_URL}/org/stats", headers=headers)
+    print(f"Organization stats: {response.status_code}")
+    
+    if response.status_code == 200:
+        stats = response.json()
+        print(f"Users: {stats['user_count']} (active: {stats['active_user_count']})")
+        return stats
+    else:
+        print(f"Error: {response.text}")
+        return None
+
+def test_organization_user_stats(token):
+    """Test that creating and deactivating a user updates the stats, and a rebuild finds no drift"""
+    print("\nTesting organization user statistics...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    before = requests.get(f"{BASE_URL}/org/stats", headers=headers).json()
+    
+    user_data = {
+        "email": f"user{int(time.time())}@testcorp.com",
+        "password": "securepassword123",
+        "first_name": "Test",
+        "last_name": "User"
+    }
+    response = requests.post(f"{BASE_URL}/org/users", json=user_data, headers=headers)
+    print(f"Create user: {response.status_code}")
+    if response.status_code != 201:
+        print(f"Error: {response.text}")
+        return False
+    user = response.json()
+    
+    created = requests.get(f"{BASE_URL}/org/stats", headers=headers).json()
+    if (created['user_count'], created['active_user_count']) != (before['user_count'] + 1, before['active_user_count'] + 1):
+        print(f"Error: stats after create {created} do not count the new user")
+        return False
+    
+    response = requests.post(f"{BASE_URL}/org/users/{user['id']}/deactivate", headers=headers)
+    print(f"Deactivate user: {response.status_code}")
+    
+    deactivated = requests.get(f"{BASE_URL}/org/stats", headers=headers).json()
+    if (deactivated['user_count'], deactivated['active_user_count']) != (created['user_count'], before['active_user_count']):
+        print(f"Error: stats after deactivate {deactivated} do not reflect the deactivation")
+        return False
+    
+    response = requests.post(f"{BASE_URL}/org/stats/rebuild", params={"background": "false"}, headers=headers)
+    drift = response.json().get("drift")
+    print(f"Rebuild stats: {response.status_code} - drift: {drift}")
+    if drift != {}:
+        print("Error: rebuild found drift in the incrementally maintained stats")
+        return False
+    
+    print("Organization user statistics are consistent")
+    return True
+
+def test_profiling(token):
+    """Test profiling a window of organization lookups"""
+    print("\nTesting profiling endpoints...")
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    options = {"mode": "sampling", "duration_seconds": 10, "route": "/org/get"}
+    response = requests.post(f"{BASE_URL}/admin/profiling/start", json=options, headers=headers)
+    print(f"Start profiling: {response.status_code}")
+    
+    if response.status_code == 403:
+        print("Profiling not allowed: admin is not listed in PROFILING_ADMIN_EMAILS")
+        return None
+    if response.status_code != 201:
+        print(f"Error: {response.text}")
+        return None
+    
+    for _ in range(20):
+        requests.get(f"{BASE_URL}/org/get", params={"organization_name": "Test Corporation"})
+    
+    response = requests.post(f"{BASE_URL}/admin/profiling/stop", headers=headers)
+    print(f"Stop profiling: {response.status_code}")
+    
+    if response.status_code == 200:
+        result = response.json()
+        print(f"Profiled requests: {len(result['requests'])}, samples: {result['samples']}")
+        return result
+    else:
+        print(f"Error: {response.text}")
+        return None
+
 def main():
     """Run all tests"""
     print("=== Organization Management API Test ===")
@@ -108,6 +213,9 @@ def main():
     # Test get organization
     test_get_organization(org['name'])
     
+    # Test batch organization lookup
+    test_get_many_organizations([org['name'], "Missing Corporation"])
+    
     # Test admin login
     token_data = test_admin_login(org['email'], "securepassword123")
     if not token_data:
@@ -117,6 +225,15 @@ def main():
     # Test admin/me endpoint
     test_admin_me(token_data['access_token'])
     
+    # Test organization stats endpoint
+    test_organization_stats(token_data['access_token'])
+    
+    # Test organization user statistics
+    test_organization_user_stats(token_data['access_token'])
+    
+    # Test profiling endpoints
+    test_profiling(token_data['access_token'])
+    
     print("\n=== All tests completed ===")
 
 if __name__ == "__main__":